@@ -0,0 +1,111 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Runs many command files through the move checker on a pool of worker
+# processes. Each output file is written next to its input file.
+
+from board import Board
+from bit_board import BitBoard
+from chess_move_checker import MoveChecker
+from compiled_program import COMPILED_SUFFIX
+from worker_pool import pool_size, start_pool, worker_state
+import argparse
+import glob
+import os
+import sys
+import time
+
+
+OUTPUT_SUFFIX = '.out'
+
+def _make_checker(use_bitboard, use_compiled):
+    """builds a worker's checker, which every file it runs reuses"""
+    return MoveChecker(BitBoard if use_bitboard else Board,
+                       use_compiled=use_compiled)
+
+
+def _check_file(infilename):
+    """runs one command file in a worker; returns its command count"""
+    return worker_state().run_files(infilename, output_name(infilename))
+
+
+def output_name(infilename):
+    """the output file written for an input file: its whole name with the
+    output suffix added, so a.txt and a.cmd never share an output"""
+    return infilename + OUTPUT_SUFFIX
+
+
+def find_command_files(paths, pattern):
+    """expands directories (using pattern) and glob patterns into a sorted
+    list of command files. Outputs and compiled caches from earlier runs are
+    left out, so a rerun never reads (and truncates) them"""
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            found.update(glob.glob(os.path.join(path, pattern)))
+        else:
+            found.update(glob.glob(path))
+    return sorted(name for name in found if os.path.isfile(name) and
+                  not name.endswith((OUTPUT_SUFFIX, COMPILED_SUFFIX)))
+
+
+def check_outputs(infilenames):
+    """raises ValueError if an output would overwrite an input or two inputs
+    would write the same output"""
+    inputs = {os.path.abspath(name) for name in infilenames}
+    writers = {}
+    for name in infilenames:
+        output = os.path.abspath(output_name(name))
+        if output in inputs:
+            raise ValueError("output %s would overwrite an input" % output_name(name))
+        if output in writers:
+            raise ValueError("%s and %s would both write %s"
+                             % (writers[output], name, output_name(name)))
+        writers[output] = name
+
+
+def run_batch(infilenames, workers=None, use_bitboard=False,
+              use_compiled=False):
+    """checks every file on a process pool.
+    Returns the total number of commands processed"""
+    if not infilenames:
+        return 0
+    check_outputs(infilenames)
+    # hand each worker a few files at a time to keep the pool busy
+    workers = pool_size(workers)
+    chunksize = max(1, len(infilenames) // (workers * 4))
+    with start_pool(_make_checker, (use_bitboard, use_compiled), workers) as pool:
+        return sum(pool.map(_check_file, infilenames, chunksize=chunksize))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        description='Check every command file in the given directories or globs')
+    parser.add_argument('paths', nargs='+',
+                        help='command files, glob patterns or directories')
+    parser.add_argument('--pattern', default='*Input.txt',
+                        help='files to pick up inside a directory (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--bitboard', action='store_true',
+                        help='use the bitboard engine')
+    parser.add_argument('--compiled', action='store_true',
+                        help='run compiled programs, cached next to each file')
+    args = parser.parse_args(argv[1:])
+
+    infilenames = find_command_files(args.paths, args.pattern)
+    try:
+        check_outputs(infilenames)
+    except ValueError as error:
+        print(error)
+        sys.exit(1)
+    start = time.perf_counter()
+    command_count = run_batch(infilenames, args.workers, args.bitboard,
+                              args.compiled)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    print("Checked %d files (%d commands) in %.2fs: %.1f files/s, %.1f commands/s"
+          % (len(infilenames), command_count, elapsed,
+             len(infilenames) / elapsed, command_count / elapsed))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
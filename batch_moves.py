@@ -0,0 +1,154 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Checks many moves on many boards at once, and finds the move masks of one
+# square on each of many boards, with NumPy array operations. Each position
+# is an 8x8 array of label codes, the same bytes readBoard produces, and
+# every answer matches Board.check_move for the same move.
+# NumPy is optional: the rest of the checker never imports this module.
+
+from chess_utils import PieceInfo
+from chess_utils import BLACK_CODE, EMPTY_CODE, LABEL_TABLE
+from bitboard_utils import BOARD_SIZE, BOARD_SQUARES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+ROOK_CODE = ord(PieceInfo.WHITE_ROOK.value)
+BISHOP_CODE = ord(PieceInfo.WHITE_BISHOP.value)
+QUEEN_CODE = ord(PieceInfo.WHITE_QUEEN.value)
+KNIGHT_CODE = ord(PieceInfo.WHITE_KNIGHT.value)
+KING_CODE = ord(PieceInfo.WHITE_KING.value)
+PAWN_CODE = ord(PieceInfo.WHITE_PAWN.value)
+
+# positions handled together by possible_moves; each one becomes 64 checks
+MASK_CHUNK_SIZE = 16384
+
+
+def _require_numpy():
+    """raises ImportError if NumPy is not installed"""
+    if np is None:
+        raise ImportError("batch move checking needs numpy")
+
+
+def encode_positions(codes):
+    """stacks boards given as 64 label bytes each (as read_board_codes
+    returns them) into an N x 8 x 8 uint8 array"""
+    _require_numpy()
+    data = b''.join(codes)
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, BOARD_SIZE, BOARD_SIZE)
+
+
+def _flatten_positions(positions):
+    """checks the shape of the positions and returns them as N x 64 label
+    codes, with every byte that is not a piece label made empty"""
+    positions = np.asarray(positions, dtype=np.uint8)
+    if positions.ndim != 3 or positions.shape[1:] != (BOARD_SIZE, BOARD_SIZE):
+        raise ValueError("positions must be an N x 8 x 8 array")
+    labels = np.frombuffer(LABEL_TABLE, dtype=np.uint8)
+    return labels[positions.reshape(len(positions), BOARD_SQUARES)]
+
+
+def check_moves(positions, moves):
+    """Returns a bool array saying whether each move is legal on its board.
+    positions is N x 8 x 8 label codes and moves is N x 4 integers
+    (from_row, from_col, to_row, to_col); move i is checked on board i"""
+    _require_numpy()
+    squares = _flatten_positions(positions)
+    moves = np.asarray(moves, dtype=np.int64)
+    if moves.shape != (len(squares), 4):
+        raise ValueError("moves must be an N x 4 array, one row per position")
+    return _check(squares, np.arange(len(squares)), moves)
+
+
+def possible_moves(positions, sources, npy_path=None):
+    """Returns an N x 8 x 8 bool array marking the squares the piece on each
+    board's source square can move to. sources is N x 2 integers (row, col).
+    Staying put is never marked, and an empty, black or off-board source
+    marks nothing. If npy_path is given the masks are also saved there"""
+    _require_numpy()
+    squares = _flatten_positions(positions)
+    sources = np.asarray(sources, dtype=np.int64)
+    if sources.shape != (len(squares), 2):
+        raise ValueError("sources must be an N x 2 array, one row per position")
+
+    masks = np.zeros((len(squares), BOARD_SQUARES), dtype=bool)
+    destinations = np.divmod(np.arange(BOARD_SQUARES), BOARD_SIZE)
+    for start in range(0, len(squares), MASK_CHUNK_SIZE):
+        chunk = squares[start:start + MASK_CHUNK_SIZE]
+        chunk_sources = sources[start:start + MASK_CHUNK_SIZE]
+        # one move from the source to every square of the board
+        moves = np.column_stack([
+            np.repeat(chunk_sources, BOARD_SQUARES, axis=0),
+            np.tile(destinations[0], len(chunk)),
+            np.tile(destinations[1], len(chunk))])
+        boards = np.repeat(np.arange(len(chunk)), BOARD_SQUARES)
+        staying = (moves[:, :2] == moves[:, 2:]).all(axis=1)
+        legal = _check(chunk, boards, moves) & ~staying
+        masks[start:start + len(chunk)] = legal.reshape(len(chunk), BOARD_SQUARES)
+
+    masks = masks.reshape(len(squares), BOARD_SIZE, BOARD_SIZE)
+    if npy_path is not None:
+        np.save(npy_path, masks)
+    return masks
+
+
+def _check(squares, boards, moves):
+    """the rules behind check_moves: move i is checked on the board in row
+    boards[i] of squares"""
+    on_board = ((moves >= 0) & (moves < BOARD_SIZE)).all(axis=1)
+    # off-board moves are clipped so they can still be looked up; their
+    # answers are thrown away at the end
+    from_row, from_col, to_row, to_col = np.clip(moves, 0, BOARD_SIZE - 1).T
+
+    def label_at(row, col):
+        return squares[boards, row * BOARD_SIZE + col]
+
+    piece = label_at(from_row, from_col)
+    target = label_at(to_row, to_col)
+    row_diff = to_row - from_row
+    col_diff = to_col - from_col
+    row_dist = np.abs(row_diff)
+    col_dist = np.abs(col_diff)
+
+    same = (row_diff == 0) & (col_diff == 0)
+    # white pieces never land on white pieces
+    open_target = (target == EMPTY_CODE) | (target == BLACK_CODE)
+
+    # sliders: walk the squares strictly between the two ends together
+    straight = (row_diff == 0) | (col_diff == 0)
+    diagonal = row_dist == col_dist
+    distance = np.maximum(row_dist, col_dist)
+    row_step = np.sign(row_diff)
+    col_step = np.sign(col_diff)
+    blocked = np.zeros(len(moves), dtype=bool)
+    for step in range(1, BOARD_SIZE - 1):
+        row = np.clip(from_row + step * row_step, 0, BOARD_SIZE - 1)
+        col = np.clip(from_col + step * col_step, 0, BOARD_SIZE - 1)
+        blocked |= (step < distance) & (label_at(row, col) != EMPTY_CODE)
+    slide = ~same & ~blocked & open_target
+
+    # rooks, queens and pawns may stay where they are
+    rook = same | (straight & slide)
+    bishop = diagonal & slide
+    queen = same | ((straight | diagonal) & slide)
+    knight = (((row_dist == 1) & (col_dist == 2)) |
+              ((row_dist == 2) & (col_dist == 1))) & open_target
+    king = (distance == 1) & open_target
+
+    # white pawns move down the board: one square, two from row 1, or a
+    # diagonal capture of a black piece
+    step_square = label_at(np.minimum(from_row + 1, BOARD_SIZE - 1), from_col)
+    pawn = (same |
+            ((col_diff == 0) & (row_diff == 1) & (target == EMPTY_CODE)) |
+            ((from_row == 1) & (col_diff == 0) & (row_diff == 2) &
+             (step_square == EMPTY_CODE) & (target == EMPTY_CODE)) |
+            ((col_dist == 1) & (row_diff == 1) & (target == BLACK_CODE)))
+
+    # black pieces and empty squares never move
+    legal = np.select(
+        [piece == ROOK_CODE, piece == BISHOP_CODE, piece == QUEEN_CODE,
+         piece == KNIGHT_CODE, piece == KING_CODE, piece == PAWN_CODE],
+        [rook, bishop, queen, knight, king, pawn], default=False)
+    return legal & on_board
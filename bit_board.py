@@ -0,0 +1,255 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# A board of chess pieces stored as 64-bit occupancy masks.
+# Answers the same queries as Board, but every move check is a handful of
+# mask operations instead of a walk over piece objects.
+
+from chess_utils import BoardInfo
+from chess_utils import PieceInfo
+from chess_utils import EMPTY_CODE
+from bitboard_utils import BISHOP_LINES, BOARD_SIZE, BOARD_SQUARES, \
+    KING_ATTACKS, KNIGHT_ATTACKS, QUEEN_LINES, ROOK_LINES, ZOBRIST_KEYS, \
+    is_on_board, iter_packed_moves, iter_squares, move_from, move_to, \
+    pack_move, pack_undo, sliding_attacks, square_bit, square_index, \
+    unpack_undo
+from piece_factory import get_piece
+
+
+class BitBoard():
+    """Manages a board of chess pieces as white, black and per-piece masks"""
+    BOARD_SIZE = BOARD_SIZE
+
+    def __init__(self):
+        self._white = 0
+        self._black = 0
+        self._piece_masks = {label: 0 for label in PieceInfo
+                             if label != PieceInfo.EMPTY}
+        # Zobrist hash of the position, the same value Board keeps
+        self._hash = 0
+        # undo records of the moves made since the position was loaded
+        self._undo_stack = []
+
+    def snapshot(self):
+        """Returns an independent board holding the same position. The masks
+        are ints, so only the label table is copied. The snapshot has no
+        moves to undo"""
+        copy = BitBoard.__new__(BitBoard)
+        copy._white = self._white
+        copy._black = self._black
+        copy._piece_masks = dict(self._piece_masks)
+        copy._hash = self._hash
+        copy._undo_stack = []
+        return copy
+
+    def write_to_file(self, outfile):
+        """writes the board to an already open output file"""
+        outfile.write(self.render())
+
+    def render(self):
+        """Returns the board as 8 lines of labels"""
+        chars = [PieceInfo.EMPTY.value] * BOARD_SQUARES
+        for label, mask in self._piece_masks.items():
+            for square in iter_squares(mask):
+                chars[square] = label.value
+        return BitBoard.__join_rows(chars)
+
+    def add_piece(self, row, col, piece):
+        """adds the piece to the board"""
+        if piece == None:
+            self._clear_square(square_index(row, col))
+        else:
+            self._set_square(square_index(row, col), piece.get_label())
+
+    def load_squares(self, codes):
+        """replaces the whole position with 64 label bytes, row by row.
+        Every byte must already be a piece label or the empty label"""
+        self.__init__()
+        for square, code in enumerate(codes):
+            if code != EMPTY_CODE:
+                self._set_square(square, PieceInfo(chr(code)))
+
+    def get_piece(self, row, col):
+        """Returns the piece on the square, or None if it is empty"""
+        label = self._get_label(square_index(row, col))
+        if label == PieceInfo.EMPTY:
+            return None
+        return get_piece(ord(label.value), square_index(row, col))
+
+    def get_square_info(self, row, col):
+        """Returns information about the square
+            (off the board, empty, black or white)"""
+        if not is_on_board(row, col):
+            return BoardInfo.OFF_THE_BOARD
+        bit = square_bit(row, col)
+        if self._white & bit:
+            return BoardInfo.WHITE
+        elif self._black & bit:
+            return BoardInfo.BLACK
+        else:
+            return BoardInfo.EMPTY
+
+    def get_hash(self):
+        """Returns the Zobrist hash of the current position"""
+        return self._hash
+
+    def get_codes(self):
+        """Returns the position as 64 label bytes, row by row"""
+        return self.render().replace('\n', '').encode('ascii')
+
+    def get_color_mask(self, color):
+        """Returns a mask of the squares holding pieces of the given color"""
+        if color == BoardInfo.WHITE:
+            return self._white
+        return self._black
+
+    def check_move(self, from_row, from_col, to_row, to_col):
+        """determine whether the arguments represent a legal move"""
+        if not (is_on_board(from_row, from_col) and is_on_board(to_row, to_col)):
+            return False
+        return bool(self._get_move_mask(square_index(from_row, from_col))
+                    & square_bit(to_row, to_col))
+
+    def make_move(self, from_row, from_col, to_row, to_col):
+        """make a move if it's legal--return false if not"""
+        if self.check_move(from_row, from_col, to_row, to_col):
+            from_square = square_index(from_row, from_col)
+            to_square = square_index(to_row, to_col)
+            label = self._get_label(from_square)
+            self._undo_stack.append(pack_undo(
+                pack_move(from_square, to_square), ord(label.value),
+                ord(self._get_label(to_square).value)))
+            # same order as Board: place the piece, then empty its old square
+            self._set_square(to_square, label)
+            self._clear_square(from_square)
+            return True
+        else:
+            return False
+
+    def unmake_move(self):
+        """takes back the last move made, putting back anything it captured.
+        Returns the packed move taken back, or None if there was none"""
+        if not self._undo_stack:
+            return None
+        move, moved_code, captured_code = unpack_undo(self._undo_stack.pop())
+        self._set_square(move_to(move), PieceInfo(chr(captured_code)))
+        self._set_square(move_from(move), PieceInfo(chr(moved_code)))
+        return move
+
+    def undo_all(self):
+        """takes back every move since the position was loaded; returns how
+        many were taken back"""
+        count = len(self._undo_stack)
+        while self._undo_stack:
+            self.unmake_move()
+        return count
+
+    def display_possible_moves(self, row, col, outfile):
+        """prints a board displaying possible moves from row,col"""
+        outfile.write(self.render_possible_moves(row, col))
+
+    def legal_moves(self, row, col):
+        """Lazily yields the moves of the piece at row,col as packed
+        (from << 6 | to) ints; an empty or off-board square has none"""
+        if is_on_board(row, col):
+            square = square_index(row, col)
+            if self._get_label(square) != PieceInfo.EMPTY:
+                # staying put is not a move, even where check_move allows it
+                yield from iter_packed_moves(
+                    square, self._get_move_mask(square) & ~(1 << square))
+
+    def generate_all_moves(self, color):
+        """Lazily yields every move of the given color's pieces as packed
+        ints, visiting only the squares those pieces are on"""
+        for square in iter_squares(self.get_color_mask(color)):
+            yield from iter_packed_moves(
+                square, self._get_move_mask(square) & ~(1 << square))
+
+    def render_possible_moves(self, row, col):
+        """Returns the board of possible moves from row,col as a string"""
+        chars = [PieceInfo.EMPTY.value] * BOARD_SQUARES
+        if is_on_board(row, col):
+            square = square_index(row, col)
+            label = self._get_label(square)
+            if label != PieceInfo.EMPTY:
+                # a piece always marks its own square
+                chars[square] = label.value
+                for move in self.legal_moves(row, col):
+                    chars[move_to(move)] = label.value
+        return BitBoard.__join_rows(chars)
+
+    def __join_rows(chars):
+        """joins 64 square characters into 8 lines"""
+        return ''.join(''.join(chars[start:start + BitBoard.BOARD_SIZE]) + '\n'
+                       for start in range(0, BOARD_SQUARES, BitBoard.BOARD_SIZE))
+
+    def _get_label(self, square):
+        """Returns the PieceInfo of the piece on square"""
+        bit = 1 << square
+        if (self._white | self._black) & bit:
+            for label, mask in self._piece_masks.items():
+                if mask & bit:
+                    return label
+        return PieceInfo.EMPTY
+
+    def _set_square(self, square, label):
+        """puts a piece with the given label on square"""
+        self._clear_square(square)
+        if label == PieceInfo.EMPTY:
+            return
+        self._hash ^= ZOBRIST_KEYS[ord(label.value)][square]
+        bit = 1 << square
+        self._piece_masks[label] |= bit
+        if label == PieceInfo.BLACK:
+            self._black |= bit
+        else:
+            self._white |= bit
+
+    def _clear_square(self, square):
+        """removes whatever piece is on square"""
+        if (self._white | self._black) & (1 << square):
+            self._hash ^= ZOBRIST_KEYS[ord(self._get_label(square).value)][square]
+        keep = ~(1 << square)
+        self._white &= keep
+        self._black &= keep
+        for label in self._piece_masks:
+            self._piece_masks[label] &= keep
+
+    def _get_move_mask(self, square):
+        """Returns the squares the piece on square may legally move to.
+        Rooks, queens and pawns may also 'move' to their own square."""
+        bit = 1 << square
+        if not self._white & bit:
+            # empty squares and black pieces never move
+            return 0
+        masks = self._piece_masks
+        occupancy = self._white | self._black
+        if masks[PieceInfo.WHITE_KNIGHT] & bit:
+            return KNIGHT_ATTACKS[square] & ~self._white
+        elif masks[PieceInfo.WHITE_KING] & bit:
+            return KING_ATTACKS[square] & ~self._white
+        elif masks[PieceInfo.WHITE_ROOK] & bit:
+            return (sliding_attacks(square, occupancy, ROOK_LINES)
+                    & ~self._white) | bit
+        elif masks[PieceInfo.WHITE_BISHOP] & bit:
+            return (sliding_attacks(square, occupancy, BISHOP_LINES)
+                    & ~self._white)
+        elif masks[PieceInfo.WHITE_QUEEN] & bit:
+            return (sliding_attacks(square, occupancy, QUEEN_LINES)
+                    & ~self._white) | bit
+        else:
+            return self._get_pawn_mask(square, occupancy)
+
+    def _get_pawn_mask(self, square, occupancy):
+        """Returns the moves of a white pawn, which moves towards row 7"""
+        row, col = divmod(square, BitBoard.BOARD_SIZE)
+        moves = 1 << square
+        if row + 1 < BitBoard.BOARD_SIZE:
+            ahead = 1 << (square + BitBoard.BOARD_SIZE)
+            if not occupancy & ahead:
+                moves |= ahead
+                two_ahead = ahead << BitBoard.BOARD_SIZE
+                if row == 1 and not occupancy & two_ahead:
+                    moves |= two_ahead
+            for capture_col in (col - 1, col + 1):
+                if 0 <= capture_col < BitBoard.BOARD_SIZE:
+                    moves |= square_bit(row + 1, capture_col) & self._black
+        return moves
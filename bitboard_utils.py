@@ -0,0 +1,223 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Constants and precomputed tables for the bitboard representation.
+# Squares are numbered row * 8 + col, so bit 0 is (0,0) and bit 63 is (7,7).
+
+from chess_utils import PieceInfo
+import random
+
+BOARD_SIZE = 8
+BOARD_SQUARES = BOARD_SIZE * BOARD_SIZE
+FULL_MASK = (1 << BOARD_SQUARES) - 1
+
+KNIGHT_OFFSETS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                  (1, -2), (1, 2), (2, -1), (2, 1)]
+KING_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1),
+                (0, 1), (1, -1), (1, 0), (1, 1)]
+
+ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+BISHOP_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+
+def square_index(row, col):
+    """Returns the bit index of the square at row, col"""
+    return row * BOARD_SIZE + col
+
+
+def square_bit(row, col):
+    """Returns a mask with only the square at row, col set"""
+    return 1 << (row * BOARD_SIZE + col)
+
+
+def is_on_board(row, col):
+    """true if row, col is a square on the board"""
+    return 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE
+
+
+def iter_squares(mask):
+    """Yields the index of every set bit in mask, lowest first"""
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+# A move is packed into one int below 2**12: the from square in bits 6-11
+# and the to square in bits 0-5
+MOVE_SHIFT = 6
+MOVE_SQUARE_MASK = (1 << MOVE_SHIFT) - 1
+
+
+def pack_move(from_square, to_square):
+    """Returns the move from one square to another as a packed int"""
+    return from_square << MOVE_SHIFT | to_square
+
+
+def move_from(move):
+    """Returns the from square of a packed move"""
+    return move >> MOVE_SHIFT
+
+
+def move_to(move):
+    """Returns the to square of a packed move"""
+    return move & MOVE_SQUARE_MASK
+
+
+def move_coords(move):
+    """Returns the (from_row, from_col, to_row, to_col) of a packed move"""
+    from_square = move >> MOVE_SHIFT
+    to_square = move & MOVE_SQUARE_MASK
+    return (from_square // BOARD_SIZE, from_square % BOARD_SIZE,
+            to_square // BOARD_SIZE, to_square % BOARD_SIZE)
+
+
+# An undo record is a packed move with the label code of the piece that moved
+# in bits 20-27 and the label code it landed on in bits 12-19
+MOVE_BITS = 2 * MOVE_SHIFT
+CODE_MASK = 0xFF
+
+
+def pack_undo(move, moved_code, captured_code):
+    """Returns the undo record of a move"""
+    return move | captured_code << MOVE_BITS | moved_code << (MOVE_BITS + 8)
+
+
+def unpack_undo(record):
+    """Returns the move, moved label code and captured label code of an
+    undo record"""
+    return (record & ((1 << MOVE_BITS) - 1), record >> (MOVE_BITS + 8),
+            (record >> MOVE_BITS) & CODE_MASK)
+
+
+def iter_packed_moves(from_square, move_mask):
+    """Yields the packed move from from_square to every square in move_mask"""
+    origin = from_square << MOVE_SHIFT
+    for to_square in iter_squares(move_mask):
+        yield origin | to_square
+
+
+def _build_jump_table(offsets):
+    """Builds the destination mask of a jumping piece for every square"""
+    table = []
+    for square in range(BOARD_SQUARES):
+        row, col = divmod(square, BOARD_SIZE)
+        mask = 0
+        for row_offset, col_offset in offsets:
+            if is_on_board(row + row_offset, col + col_offset):
+                mask |= square_bit(row + row_offset, col + col_offset)
+        table.append(mask)
+    return table
+
+
+def _build_ray_table(direction):
+    """Builds the mask of every square past each square in one direction"""
+    row_step, col_step = direction
+    table = []
+    for square in range(BOARD_SQUARES):
+        row, col = divmod(square, BOARD_SIZE)
+        mask = 0
+        row += row_step
+        col += col_step
+        while is_on_board(row, col):
+            mask |= square_bit(row, col)
+            row += row_step
+            col += col_step
+        table.append(mask)
+    return table
+
+
+def _build_between_table():
+    """Builds the mask of the squares strictly between every pair of squares
+    that share a row, column or diagonal (0 for any other pair)"""
+    table = [[0] * BOARD_SQUARES for square in range(BOARD_SQUARES)]
+    for square in range(BOARD_SQUARES):
+        for row_step, col_step in QUEEN_DIRECTIONS:
+            row, col = divmod(square, BOARD_SIZE)
+            passed = 0
+            row += row_step
+            col += col_step
+            while is_on_board(row, col):
+                table[square][square_index(row, col)] = passed
+                passed |= square_bit(row, col)
+                row += row_step
+                col += col_step
+    return table
+
+
+KNIGHT_ATTACKS = _build_jump_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _build_jump_table(KING_OFFSETS)
+RAYS = {direction: _build_ray_table(direction)
+        for direction in QUEEN_DIRECTIONS}
+BETWEEN = _build_between_table()
+
+# one random 64-bit key per piece label code per square; a position's hash is the
+# xor of the keys of its pieces. The seed is fixed so hashes are repeatable.
+_zobrist_random = random.Random(327)
+ZOBRIST_KEYS = {ord(label.value): [_zobrist_random.getrandbits(64)
+                                  for square in range(BOARD_SQUARES)]
+                for label in PieceInfo if label != PieceInfo.EMPTY}
+
+
+def _ray_attacks(square, occupancy, directions):
+    """Returns every square a slider on square reaches in the given
+    directions, stopping at (and including) the first occupied square"""
+    attacks = 0
+    for direction in directions:
+        ray = RAYS[direction][square]
+        blockers = ray & occupancy
+        if blockers:
+            ray ^= RAYS[direction][_nearest_square(blockers, direction)]
+        attacks |= ray
+    return attacks
+
+
+def _nearest_square(mask, direction):
+    """Returns the square of mask met first when walking in direction"""
+    # rays that increase the square index meet their lowest square first
+    if direction[0] * BOARD_SIZE + direction[1] > 0:
+        return (mask & -mask).bit_length() - 1
+    return mask.bit_length() - 1
+
+
+def _build_line_table(line):
+    """Builds, for every square, the mask of occupancy squares that can block
+    a slider along line and a table from each such occupancy to its attacks.
+    The last square of each ray never blocks anything, so it is left out of
+    the mask, which keeps every table at 64 entries or fewer."""
+    relevant_masks = []
+    attack_tables = []
+    for square in range(BOARD_SQUARES):
+        relevant = 0
+        for direction in line:
+            ray = RAYS[direction][square]
+            if ray:
+                far_end = _nearest_square(ray, (-direction[0], -direction[1]))
+                relevant |= ray & ~(1 << far_end)
+        table = {}
+        # walk every subset of the relevant squares
+        occupancy = 0
+        while True:
+            table[occupancy] = _ray_attacks(square, occupancy, line)
+            occupancy = (occupancy - relevant) & relevant
+            if occupancy == 0:
+                break
+        relevant_masks.append(relevant)
+        attack_tables.append(table)
+    return relevant_masks, attack_tables
+
+
+# rook lines are the row and the column, bishop lines the two diagonals
+ROOK_LINES = [_build_line_table(line) for line in
+              [((0, -1), (0, 1)), ((-1, 0), (1, 0))]]
+BISHOP_LINES = [_build_line_table(line) for line in
+                [((-1, -1), (1, 1)), ((-1, 1), (1, -1))]]
+QUEEN_LINES = ROOK_LINES + BISHOP_LINES
+
+
+def sliding_attacks(square, occupancy, lines):
+    """Returns every square a slider on square reaches along the given lines,
+    stopping at (and including) the first occupied square each way"""
+    attacks = 0
+    for relevant_masks, attack_tables in lines:
+        attacks |= attack_tables[square][occupancy & relevant_masks[square]]
+    return attacks
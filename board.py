@@ -4,7 +4,13 @@
 
 from chess_utils import BoardInfo
 from chess_utils import PieceInfo
+from chess_utils import BLACK_CODE, EMPTY_CODE
 from chess_piece import ChessPiece
+from bitboard_utils import BOARD_SQUARES, ZOBRIST_KEYS, iter_packed_moves, \
+    iter_squares, move_from, move_to, pack_move, pack_undo, square_bit, \
+    square_index, unpack_undo
+from lru_cache import LRUCache
+from piece_factory import get_piece
 # from knight import Knight
 from enum import Enum
 
@@ -12,73 +18,308 @@ from enum import Enum
 class Board():
     """Manages a board of chess pieces"""
     BOARD_SIZE = 8
+    MOVE_CACHE_SIZE = 4096
+
+    # rendered genPossMoves grids keyed by (position hash, row, col),
+    # shared by every board so repeated positions hit across readBoards
+    _move_cache = LRUCache(MOVE_CACHE_SIZE)
+
+    # the label bytes of a board with nothing on it
+    __EMPTY_SQUARES = PieceInfo.EMPTY.value.encode('ascii') * BOARD_SQUARES
 
     def __init__(self):
-        self._board_info = [
-            [None]*Board.BOARD_SIZE for i in range(Board.BOARD_SIZE)]
+        # one label byte per square, row by row. Pieces are never stored:
+        # the shared piece for a label and square is fetched when needed
+        self._squares = bytearray(PieceInfo.EMPTY.value * BOARD_SQUARES, 'ascii')
+        # occupancy of each color as a 64-bit mask, kept in step with _squares.
+        # These are the color's piece lists: walking the set bits visits
+        # each of its pieces and no empty square
+        self._color_masks = {BoardInfo.WHITE: 0, BoardInfo.BLACK: 0}
+        # Zobrist hash of the position, updated as pieces are placed
+        self._hash = 0
+        # move mask of each piece whose moves have been worked out, and the
+        # squares each of those masks depends on; a change to a watched square
+        # drops the entry so only the affected pieces are recomputed
+        self._legal_moves = {}
+        self._watch_masks = {}
+        # the text of the board, kept until the position changes
+        self._rendered = None
+        # bumped by every change to the position
+        self._generation = 0
+        # checkMove answers keyed by (from_row, from_col, to_row, to_col),
+        # valid only while _generation still equals _memo_generation
+        self._check_memo = {}
+        self._memo_generation = 0
+        self._memo_hits = 0
+        self._memo_misses = 0
+        # undo record (see pack_undo) of every move made since the position
+        # was loaded, newest last
+        self._undo_stack = []
+        # true while _squares, _color_masks, _legal_moves and _watch_masks
+        # may be shared with a snapshot; they are copied before any change
+        self._shared = False
+
+    def snapshot(self):
+        """Returns an independent board holding the same position. The two
+        share their storage until either one changes, so a fork costs a few
+        attribute copies. The snapshot has no moves to undo"""
+        copy = Board.__new__(Board)
+        copy._squares = self._squares
+        copy._color_masks = self._color_masks
+        copy._hash = self._hash
+        copy._legal_moves = self._legal_moves
+        copy._watch_masks = self._watch_masks
+        copy._rendered = self._rendered
+        copy._generation = self._generation
+        copy._check_memo = {}
+        copy._memo_generation = self._generation
+        copy._memo_hits = 0
+        copy._memo_misses = 0
+        copy._undo_stack = []
+        copy._shared = True
+        self._shared = True
+        return copy
 
     def write_to_file(self, outfile):
         """writes the board to an already open output file"""
-        for row in self._board_info:
-            for piece in row:
-                if piece == None:
-                    outfile.write(PieceInfo.EMPTY.value)
-                else:
-                    outfile.write(piece.get_label().value) 
-            outfile.write('\n')
+        outfile.write(self.render())
+
+    def render(self):
+        """Returns the board as 8 lines of labels, built once per position"""
+        if self._rendered is None:
+            self._rendered = Board.__join_rows(self._squares)
+        return self._rendered
 
     def add_piece(self, row, col, piece):
         """adds the piece to the board"""
-        self._board_info[row][col] = piece
+        if piece == None:
+            self.__place(square_index(row, col), EMPTY_CODE)
+        else:
+            self.__place(square_index(row, col), ord(piece.get_label().value))
+
+    def load_squares(self, codes):
+        """replaces the whole position with 64 label bytes, row by row.
+        Every byte must already be a piece label or the empty label"""
+        # new storage, so nothing is written into a snapshot's squares
+        self._squares = bytearray(codes)
+        self._rendered = None
+        self._color_masks = {BoardInfo.WHITE: 0, BoardInfo.BLACK: 0}
+        self._hash = 0
+        self._legal_moves = {}
+        self._watch_masks = {}
+        self._shared = False
+        self._undo_stack.clear()
+        self._generation += 1
+        for square, code in enumerate(self._squares):
+            if code != EMPTY_CODE:
+                color = BoardInfo.BLACK if code == BLACK_CODE else BoardInfo.WHITE
+                self._color_masks[color] |= 1 << square
+                self._hash ^= ZOBRIST_KEYS[code][square]
+
+    def get_piece(self, row, col):
+        """Returns the piece on the square, or None if it is empty"""
+        code = self._squares[square_index(row, col)]
+        if code == EMPTY_CODE:
+            return None
+        return get_piece(code, square_index(row, col))
+
+    def get_color_mask(self, color):
+        """Returns a mask of the squares holding pieces of the given color"""
+        return self._color_masks[color]
+
+    def get_hash(self):
+        """Returns the Zobrist hash of the current position"""
+        return self._hash
+
+    def get_codes(self):
+        """Returns the position as 64 label bytes, row by row"""
+        return bytes(self._squares)
+
+    @staticmethod
+    def get_move_cache_stats():
+        """Returns the hits, misses and hit rate of the genPossMoves cache"""
+        cache = Board._move_cache
+        return cache.hits, cache.misses, cache.hit_rate()
+
+    def get_generation(self):
+        """Returns how many times the position has changed"""
+        return self._generation
+
+    def get_check_memo_stats(self):
+        """Returns the hits, misses and hit rate of the checkMove memo"""
+        lookups = self._memo_hits + self._memo_misses
+        return (self._memo_hits, self._memo_misses,
+                self._memo_hits / lookups if lookups else 0.0)
 
     def get_square_info(self, row, col):
         """Returns information about the square 
             (off the board, empty, black or white)"""
         if not(Board.__is_on_board(row) and Board.__is_on_board(col)):
             return BoardInfo.OFF_THE_BOARD
-        elif self._board_info[row][col] == None:
+        code = self._squares[square_index(row, col)]
+        if code == EMPTY_CODE:
             return BoardInfo.EMPTY
+        elif code == BLACK_CODE:
+            return BoardInfo.BLACK
         else:
-            return self._board_info[row][col].get_color()
+            return BoardInfo.WHITE
 
     def check_move(self, from_row, from_col, to_row, to_col):
         """determine whether the arguments represent a legal move"""
+        if self._memo_generation != self._generation:
+            # the position changed since the memo was filled
+            self._check_memo = {}
+            self._memo_generation = self._generation
+        key = (from_row, from_col, to_row, to_col)
+        is_legal = self._check_memo.get(key)
+        if is_legal is None:
+            self._memo_misses += 1
+            is_legal = self.__find_move(from_row, from_col, to_row, to_col)
+            self._check_memo[key] = is_legal
+        else:
+            self._memo_hits += 1
+        return is_legal
+
+    def __find_move(self, from_row, from_col, to_row, to_col):
+        """works out whether the arguments represent a legal move"""
         is_legal = False  # assume false
-        if Board.__is_on_board(from_row) and Board.__is_on_board(from_col) and Board.__is_on_board(to_row) and Board.__is_on_board(to_col) and self._board_info[from_row][from_col] != None:
-            is_legal = self._board_info[from_row][from_col].is_legal_move(
-                to_row, to_col, self)
+        if Board.__is_on_board(from_row) and Board.__is_on_board(from_col) and Board.__is_on_board(to_row) and Board.__is_on_board(to_col) and self.get_piece(from_row, from_col) != None:
+            if from_row == to_row and from_col == to_col:
+                # only the piece knows whether it may stay where it is
+                is_legal = self.get_piece(from_row, from_col).is_legal_move(
+                    to_row, to_col, self)
+            else:
+                is_legal = bool(self.__get_legal_moves(from_row, from_col)
+                                & square_bit(to_row, to_col))
         return is_legal
 
     def make_move(self, from_row, from_col, to_row, to_col):
         """make a move if it's legal--return false if not"""
         if self.check_move(from_row, from_col, to_row, to_col):
-            self._board_info[from_row][from_col].move(to_row, to_col)
-            self._board_info[to_row][to_col] = self._board_info[from_row][from_col]
-            self._board_info[from_row][from_col] = None
+            # pieces are shared, so moving one only moves its label
+            from_square = square_index(from_row, from_col)
+            to_square = square_index(to_row, to_col)
+            moved_code = self._squares[from_square]
+            self._undo_stack.append(pack_undo(pack_move(from_square, to_square),
+                                              moved_code, self._squares[to_square]))
+            self.__place(to_square, moved_code)
+            self.__place(from_square, EMPTY_CODE)
             return True
         else:
             return False
 
+    def unmake_move(self):
+        """takes back the last move made, putting back anything it captured.
+        Returns the packed move taken back, or None if there was none"""
+        if not self._undo_stack:
+            return None
+        move, moved_code, captured_code = unpack_undo(self._undo_stack.pop())
+        # reverse of make_move: the to square first, then the from square
+        self.__place(move_to(move), captured_code)
+        self.__place(move_from(move), moved_code)
+        return move
+
+    def undo_all(self):
+        """takes back every move since the position was loaded; returns how
+        many were taken back"""
+        count = len(self._undo_stack)
+        while self._undo_stack:
+            self.unmake_move()
+        return count
+
     def display_possible_moves(self, row, col, outfile):
         """prints a board displaying possible moves from row,col"""
-        # make an empty display board
-        char_board = Board.__make_empty_char_board()
-
-        # add valid moves (if any)
-        if Board.__is_on_board(row) and Board.__is_on_board(col) and self._board_info[row][col] != None:
-            char_board = self._board_info[row][col].generate_legal_moves(
-                char_board, self)
-
-        # display the result
-        for row in char_board:
-            for piece in row:
-                outfile.write(piece)
-            outfile.write('\n')
-
-    def __make_empty_char_board():
-        """make an empty board of characters"""
-        return [[PieceInfo.EMPTY.value]*Board.BOARD_SIZE
-                for i in range(Board.BOARD_SIZE)]
+        outfile.write(self.render_possible_moves(row, col))
+
+    def legal_moves(self, row, col):
+        """Lazily yields the moves of the piece at row,col as packed
+        (from << 6 | to) ints; an empty or off-board square has none"""
+        if Board.__is_on_board(row) and Board.__is_on_board(col) and self.get_piece(row, col) != None:
+            yield from iter_packed_moves(square_index(row, col),
+                                         self.__get_legal_moves(row, col))
+
+    def generate_all_moves(self, color):
+        """Lazily yields every move of the given color's pieces as packed
+        ints, visiting only the squares those pieces are on"""
+        for square in iter_squares(self._color_masks[color]):
+            yield from iter_packed_moves(square, self.__get_legal_moves(
+                square // Board.BOARD_SIZE, square % Board.BOARD_SIZE))
+
+    def render_possible_moves(self, row, col):
+        """Returns the board of possible moves from row,col as a string"""
+        key = (self._hash, row, col)
+        display = Board._move_cache.get(key)
+        if display is None:
+            # start from an empty display board
+            labels = bytearray(Board.__EMPTY_SQUARES)
+
+            # the piece (if any) marks its own square and every destination
+            if Board.__is_on_board(row) and Board.__is_on_board(col) and self.get_piece(row, col) != None:
+                code = self._squares[square_index(row, col)]
+                labels[square_index(row, col)] = code
+                for move in self.legal_moves(row, col):
+                    labels[move_to(move)] = code
+
+            display = Board.__join_rows(labels)
+            Board._move_cache.put(key, display)
+        return display
+
+    def __place(self, square, code):
+        """puts the label code on the square and updates the color masks
+        and the hash"""
+        if self._shared:
+            self.__unshare()
+        bit = 1 << square
+        old_code = self._squares[square]
+        for color in self._color_masks:
+            self._color_masks[color] &= ~bit
+        if old_code != EMPTY_CODE:
+            self._hash ^= ZOBRIST_KEYS[old_code][square]
+        if code != EMPTY_CODE:
+            color = BoardInfo.BLACK if code == BLACK_CODE else BoardInfo.WHITE
+            self._color_masks[color] |= bit
+            self._hash ^= ZOBRIST_KEYS[code][square]
+        self._squares[square] = code
+        self._rendered = None
+        self._generation += 1
+        self.__forget_moves(bit)
+
+    def __get_legal_moves(self, row, col):
+        """Returns the move mask of the piece at row,col, working it out only
+        if the squares it depends on changed since it was last asked for"""
+        square = square_index(row, col)
+        moves = self._legal_moves.get(square)
+        if moves is None:
+            piece = self.get_piece(row, col)
+            moves = piece.get_move_mask(self)
+            if self._shared:
+                self.__unshare()
+            self._legal_moves[square] = moves
+            self._watch_masks[square] = piece.get_watch_mask(self)
+        return moves
+
+    def __unshare(self):
+        """gives the board its own copy of the storage it shares with
+        snapshots, so it can change it"""
+        self._squares = bytearray(self._squares)
+        self._color_masks = dict(self._color_masks)
+        self._legal_moves = dict(self._legal_moves)
+        self._watch_masks = dict(self._watch_masks)
+        self._shared = False
+
+    def __forget_moves(self, changed):
+        """drops the stored moves of every piece on or watching a changed square"""
+        stale = [square for square, watched in self._watch_masks.items()
+                 if (watched | (1 << square)) & changed]
+        for square in stale:
+            del self._legal_moves[square]
+            del self._watch_masks[square]
+
+    def __join_rows(labels):
+        """turns 64 label bytes into 8 lines of text"""
+        text = labels.decode('ascii')
+        return ''.join(text[start:start + Board.BOARD_SIZE] + '\n'
+                       for start in range(0, BOARD_SQUARES, Board.BOARD_SIZE))
 
     def __is_on_board(index):
         """true if the index is on the board"""
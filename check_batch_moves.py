@@ -0,0 +1,116 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Checks the NumPy batch routines in batch_moves against Board's checkMove
+# and genPossMoves answers on random positions. Prints the first
+# disagreements and exits with status 1 if there are any; skips quietly when
+# NumPy is not installed.
+
+from board import Board
+from bitboard_utils import BOARD_SIZE, BOARD_SQUARES
+import batch_moves
+import random
+import sys
+
+
+# how many positions to try, and the moves checked on each
+POSITIONS = 300
+MOVES_PER_POSITION = 60
+
+# labels drawn for occupied squares; black is weighted like the samples
+PIECE_LABELS = b'KNRPBQbbb'
+
+
+def random_codes(rng):
+    """Returns 64 label bytes of a random position of random density"""
+    density = rng.random()
+    return bytes(rng.choice(PIECE_LABELS) if rng.random() < density else ord('_')
+                 for square in range(BOARD_SQUARES))
+
+
+def random_move(rng, codes):
+    """Returns a move from an occupied square most of the time, sometimes
+    from anywhere, to the same square or off the board"""
+    choice = rng.random()
+    if choice < 0.1:
+        return [rng.randint(-2, BOARD_SIZE + 1) for coordinate in range(4)]
+    occupied = [square for square in range(BOARD_SQUARES) if codes[square] != ord('_')]
+    if choice < 0.3 or not occupied:
+        source = rng.randrange(BOARD_SQUARES)
+    else:
+        source = rng.choice(occupied)
+    row, col = divmod(source, BOARD_SIZE)
+    if choice > 0.9:
+        return [row, col, row, col]
+    return [row, col, rng.randrange(BOARD_SIZE), rng.randrange(BOARD_SIZE)]
+
+
+def check_moves_agree(rng):
+    """compares batch_moves.check_moves with Board.check_move; returns the
+    list of disagreements"""
+    codes, moves, expected = [], [], []
+    for position in range(POSITIONS):
+        position_codes = random_codes(rng)
+        board = Board()
+        board.load_squares(position_codes)
+        for count in range(MOVES_PER_POSITION):
+            move = random_move(rng, position_codes)
+            codes.append(position_codes)
+            moves.append(move)
+            expected.append(bool(board.check_move(*move)))
+
+    results = batch_moves.check_moves(batch_moves.encode_positions(codes), moves)
+    return ["check_moves %s on %s: got %s" % (moves[index], codes[index], bool(results[index]))
+            for index in range(len(moves)) if bool(results[index]) != expected[index]]
+
+
+def render_mask(mask, codes, row, col):
+    """draws a move mask the way render_possible_moves draws its board: the
+    piece's label on every destination and on its own square"""
+    labels = bytearray(b'_' * BOARD_SQUARES)
+    if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
+        code = codes[row * BOARD_SIZE + col]
+        if code != ord('_'):
+            labels[row * BOARD_SIZE + col] = code
+            for square in range(BOARD_SQUARES):
+                if mask[square // BOARD_SIZE][square % BOARD_SIZE]:
+                    labels[square] = code
+    text = labels.decode('ascii')
+    return ''.join(text[start:start + BOARD_SIZE] + '\n'
+                   for start in range(0, BOARD_SQUARES, BOARD_SIZE))
+
+
+def possible_moves_agree(rng):
+    """compares batch_moves.possible_moves with Board.render_possible_moves;
+    returns the list of disagreements"""
+    codes, sources, expected = [], [], []
+    for position in range(POSITIONS):
+        position_codes = random_codes(rng)
+        board = Board()
+        board.load_squares(position_codes)
+        for count in range(MOVES_PER_POSITION // 4):
+            source = random_move(rng, position_codes)[:2]
+            codes.append(position_codes)
+            sources.append(source)
+            expected.append(board.render_possible_moves(*source))
+
+    masks = batch_moves.possible_moves(batch_moves.encode_positions(codes), sources)
+    return ["possible_moves %s on %s" % (sources[index], codes[index])
+            for index in range(len(sources))
+            if render_mask(masks[index], codes[index], *sources[index]) != expected[index]]
+
+
+def main(argv):
+    if batch_moves.np is None:
+        print("numpy is not installed; batch move checks skipped")
+        return
+
+    rng = random.Random(int(argv[1]) if len(argv) > 1 else 327)
+    problems = check_moves_agree(rng) + possible_moves_agree(rng)
+    for problem in problems[:10]:
+        print(problem)
+    if problems:
+        print("%d disagreements with Board" % len(problems))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
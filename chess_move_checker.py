@@ -5,116 +5,299 @@
 # 10/22/2021
 
 from board import Board
+from bit_board import BitBoard
 from chess_utils import BoardInfo
-from chess_utils import PieceInfo
-from chess_piece import ChessPiece
-from mec_pieces import BlackPiece
-from mec_pieces import King
-from my_pieces import Knight, Rook, WhitePawn, Bishop, Queen
+from bitboard_utils import move_coords
+from command_parser import CHECK_MOVE, GEN_ALL_MOVES, GEN_POSS_MOVES, \
+    MAKE_MOVE, PERFT, QUIT, READ_BOARD, UNDO_ALL, UNDO_MOVE, WRITE_BOARD, \
+    parse_commands
+from compiled_program import OP_CHECK_MOVE, OP_GEN_POSS_MOVES, OP_LINE, \
+    OP_MAKE_MOVE, OP_READ_BOARD, OP_WRITE_BOARD, iter_program, load_program, \
+    program_commands
+from output_writer import OutputWriter
+from perft import perft_divide, perft_divide_parallel, transpositions
+from pipeline_threads import threaded
 import sys
 
 
+# output messages, filled in with the command's own row and column text
+MOVED_MESSAGE = "Moved from ({},{}) to ({},{})\nNew board state: \n".format
+CAN_MOVE_MESSAGE = "Can move from ({},{}) to ({},{})\n".format
+NOT_POSSIBLE_MESSAGE = "Move from ({},{}) to ({},{}) is not possible\n".format
+POSSIBLE_MOVES_MESSAGE = "Possible moves from ({},{})\n".format
+ALL_MOVES_MESSAGE = "All possible moves for {} ({})\n".format
+MOVE_LINE = "({},{}) to ({},{})\n".format
+UNDID_MOVE_MESSAGE = "Undid move from ({},{}) to ({},{})\nNew board state: \n".format
+UNDID_ALL_MESSAGE = "Undid {} moves\nNew board state: \n".format
+NO_UNDO_MESSAGE = "No move to undo\n"
+UNKNOWN_COLOR_MESSAGE = "Unknown color {} for genAllMoves\n".format
+PERFT_MESSAGE = "Perft to depth {}\n".format
+PERFT_MOVE_LINE = "({},{}) to ({},{}): {}\n".format
+PERFT_NODES_MESSAGE = "Nodes: {}\n".format
 
-def make_piece(row, column, label):
-    """create a piece given a location and label"""
-    if label == PieceInfo.BLACK.value:
-        return BlackPiece(row, column)
-    elif label == PieceInfo.WHITE_KING.value:
-        return King(row, column, BoardInfo.WHITE, PieceInfo(label))
-    # create comparable entries for each piece as you create it
-    elif label == PieceInfo.WHITE_KNIGHT.value:
-        return Knight(row, column, BoardInfo.WHITE, PieceInfo(label))
-    elif label == PieceInfo.WHITE_ROOK.value:
-        return Rook(row, column, BoardInfo.WHITE, PieceInfo(label))
-    elif label == PieceInfo.WHITE_PAWN.value:
-        return WhitePawn(row, column, BoardInfo.WHITE, PieceInfo(label))
-    elif label == PieceInfo.WHITE_BISHOP.value:
-        return Bishop(row, column, BoardInfo.WHITE, PieceInfo(label))
-    elif label == PieceInfo.WHITE_QUEEN.value:
-        return Queen(row, column, BoardInfo.WHITE, PieceInfo(label))
-    else:
-        return None
-    
-
-
-def read_board(infile):
-    board = Board()
-    for row in range(Board.BOARD_SIZE):
-        line = infile.readline()
-        for col in range(Board.BOARD_SIZE):
-            board.add_piece(row, col, make_piece(row, col, line[col]))
-    return board
+# the sides genAllMoves accepts; white moves when none is given
+COLOR_NAMES = {'white': BoardInfo.WHITE, 'black': BoardInfo.BLACK}
 
 
-def handle_move(locs, board, outfile, moving):
-    """handle move commands"""
+def move_result(locs, board, moving):
+    """checks or makes a move and returns the text reporting it"""
     from_row = int(locs[0])
     from_col = int(locs[1])
     to_row = int(locs[2])
     to_col = int(locs[3])
 
-    succeeded = False
     if (moving):
-        succeeded = board.make_move(from_row, from_col, to_row, to_col)
-        if succeeded:
-            outfile.write("Moved from ("+locs[0]+","+locs[1] +
-                          ") to ("+locs[2]+","+locs[3]+")\n")
-            outfile.write("New board state: \n")
-            board.write_to_file(outfile)
-    else:
-        succeeded = board.check_move(from_row, from_col, to_row, to_col)
-        if succeeded:
-            outfile.write("Can move from ("+locs[0]+","+locs[1] +
-                          ") to ("+locs[2]+","+locs[3]+")\n")
-    if not succeeded:
-        outfile.write("Move from ("+locs[0]+","+locs[1] +
-                      ") to ("+locs[2]+","+locs[3]+") is not possible\n")
+        if board.make_move(from_row, from_col, to_row, to_col):
+            return MOVED_MESSAGE(*locs[:4]) + board.render()
+    elif board.check_move(from_row, from_col, to_row, to_col):
+        return CAN_MOVE_MESSAGE(*locs[:4])
+    return NOT_POSSIBLE_MESSAGE(*locs[:4])
 
 
-def display_possible_moves(loc, board, outfile):
+def possible_moves_result(loc, board):
+    """returns the text showing the possible moves from a square"""
     row = int(loc[0])
     col = int(loc[1])
+    return (POSSIBLE_MOVES_MESSAGE(*loc[:2]) +
+            board.render_possible_moves(row, col) + '\n')
 
-    outfile.write("Possible moves from ("+loc[0]+","+loc[1] + ")\n")
-    board.display_possible_moves(row, col, outfile)
-    outfile.write('\n')
 
+def undo_move_result(board):
+    """takes back the last move and returns the text reporting it"""
+    move = board.unmake_move()
+    if move is None:
+        return NO_UNDO_MESSAGE
+    return UNDID_MOVE_MESSAGE(*move_coords(move)) + board.render()
 
-# program start here
-# get the file names from the command line
-if len(sys.argv) < 3:
-    print("correct usage: "+sys.argv[0]+"inputfilename outputfilename")
-    sys.exit(1)
-
-infilename = sys.argv[1]
-outfilename = sys.argv[2]
-
-# since we're just processing an input file to produce an output file
-# go ahead and set those up
-infile = open(infilename, 'r')
-outfile = open(outfilename, 'w')
-
-board = None
-processing = True
-
-while processing:
-    # read a command
-    command = infile.readline().strip()
-    if command == 'readBoard':
-        board = read_board(infile)
-    elif command == 'writeBoard':
-        board.write_to_file(outfile)
-    elif command == 'quit':
-        processing = False
+
+def undo_all_result(board):
+    """takes back every move and returns the text reporting it"""
+    return UNDID_ALL_MESSAGE(board.undo_all()) + board.render()
+
+
+def all_moves_result(args, board):
+    """returns the text listing every move of one side, one per line, or a
+    line naming the side if it is not a color"""
+    color_name = args[0] if args else 'white'
+    color = COLOR_NAMES.get(color_name)
+    if color is None:
+        return UNKNOWN_COLOR_MESSAGE(color_name)
+    lines = [MOVE_LINE(*move_coords(move))
+             for move in board.generate_all_moves(color)]
+    return ALL_MOVES_MESSAGE(color_name, len(lines)) + ''.join(lines) + '\n'
+
+
+def perft_result(args, board):
+    """counts the move sequences to a depth and returns the text giving the
+    count under each first move and the total. An optional second argument
+    splits the first moves over that many worker processes"""
+    depth = int(args[0])
+    workers = int(args[1]) if len(args) > 1 else 0
+    if workers > 1:
+        counts = perft_divide_parallel(board, depth, workers)
     else:
-        args = command.split()
-        print(args)
-        if args[0] == 'checkMove':
-            handle_move(args[1:], board, outfile, False)
-        elif args[0] == 'makeMove':
-            handle_move(args[1:], board, outfile, True)
-        elif args[0] == 'genPossMoves':
-            display_possible_moves(args[1:], board, outfile)
-
-infile.close()
-outfile.close()
+        counts = perft_divide(board, depth, transpositions)
+    # depth 0 counts the empty sequence; deeper, a side with no moves has none
+    nodes = sum(count for move, count in counts) if depth > 0 else 1
+    return (PERFT_MESSAGE(args[0]) +
+            ''.join(PERFT_MOVE_LINE(*move_coords(move), count)
+                    for move, count in counts) +
+            PERFT_NODES_MESSAGE(nodes) + '\n')
+
+
+# The checker is a pipeline of generators, so input of any length streams
+# through in constant memory: lines -> commands -> output text -> file.
+# The command sources live in command_parser.
+
+def echo_commands(commands, echo=print):
+    """passes commands through, showing the arguments of each move command"""
+    for command in commands:
+        if command.name not in (READ_BOARD, WRITE_BOARD, QUIT):
+            echo([command.name] + command.args)
+        yield command
+
+
+def command_result(name, args, board):
+    """runs any command but readBoard and returns its output text (empty
+    for commands that print nothing)"""
+    if name == WRITE_BOARD:
+        return board.render()
+    elif name == CHECK_MOVE:
+        return move_result(args, board, False)
+    elif name == MAKE_MOVE:
+        return move_result(args, board, True)
+    elif name == GEN_POSS_MOVES:
+        return possible_moves_result(args, board)
+    elif name == GEN_ALL_MOVES:
+        return all_moves_result(args, board)
+    elif name == UNDO_MOVE:
+        return undo_move_result(board)
+    elif name == UNDO_ALL:
+        return undo_all_result(board)
+    elif name == PERFT:
+        return perft_result(args, board)
+    return ''
+
+
+def execute_commands(commands, board_class=Board):
+    """runs each command against the current board and yields its output
+    text (empty for commands that print nothing)"""
+    board = None
+    for name, args in commands:
+        if name == READ_BOARD:
+            board = board_class()
+            board.load_squares(args)
+            yield ''
+        else:
+            yield command_result(name, args, board)
+
+
+def execute_program(program, board_class=Board):
+    """runs a compiled program like execute_commands, straight from its
+    packed squares. The coordinates were plain digits, so the messages
+    print the numbers themselves"""
+    board = None
+    for opcode, operands in iter_program(program):
+        if opcode == OP_CHECK_MOVE:
+            if board.check_move(*operands):
+                yield CAN_MOVE_MESSAGE(*operands)
+            else:
+                yield NOT_POSSIBLE_MESSAGE(*operands)
+        elif opcode == OP_MAKE_MOVE:
+            if board.make_move(*operands):
+                yield MOVED_MESSAGE(*operands) + board.render()
+            else:
+                yield NOT_POSSIBLE_MESSAGE(*operands)
+        elif opcode == OP_GEN_POSS_MOVES:
+            yield (POSSIBLE_MOVES_MESSAGE(*operands) +
+                   board.render_possible_moves(*operands) + '\n')
+        elif opcode == OP_READ_BOARD:
+            board = board_class()
+            board.load_squares(operands)
+            yield ''
+        elif opcode == OP_WRITE_BOARD:
+            yield board.render()
+        elif opcode == OP_LINE:
+            yield command_result(operands.name, operands.args, board)
+        else:
+            yield ''
+
+
+def write_output(outputs, outfile):
+    """writes every output to an open file; returns how many there were"""
+    writer = OutputWriter(outfile)
+    count = 0
+    try:
+        for text in outputs:
+            count += 1
+            if text:
+                writer.write(text)
+    finally:
+        writer.flush()
+    return count
+
+
+class MoveChecker():
+    """Runs command files against a board; one checker can run any number
+    of files in the same process"""
+
+    # characters of buffering for output files opened by run_files
+    OUTPUT_BUFFER_SIZE = 1 << 20
+
+    def __init__(self, board_class=Board, debug=False, use_threads=False,
+                 use_compiled=False):
+        self._board_class = board_class
+        self._debug = debug
+        # read, check and write on three threads joined by bounded queues
+        self._use_threads = use_threads
+        # run named input files from their compiled programs, cached on disk
+        self._use_compiled = use_compiled
+
+    def run(self, infile, outfile):
+        """processes commands from an open input file until quit (or the end
+        of the file), writing the results to an open output file.
+        Returns the number of commands processed"""
+        return self.run_commands(parse_commands(infile), outfile)
+
+    def run_commands(self, commands, outfile):
+        """processes Commands from any source, writing the results to an
+        open output file. Returns the number of commands processed"""
+        if self._debug:
+            commands = echo_commands(commands)
+        if self._use_threads:
+            commands = threaded(commands)
+        outputs = execute_commands(commands, self._board_class)
+        if self._use_threads:
+            outputs = threaded(outputs)
+        return write_output(outputs, outfile)
+
+    def run_program(self, program, outfile):
+        """processes a compiled program, writing the results to an open
+        output file. Returns the number of commands processed"""
+        if self._debug:
+            # the echo shows Commands, so take the ordinary path
+            return self.run_commands(program_commands(program), outfile)
+        outputs = execute_program(program, self._board_class)
+        if self._use_threads:
+            outputs = threaded(outputs)
+        return write_output(outputs, outfile)
+
+    def run_files(self, infilename, outfilename):
+        """processes the named input file into the named output file ('-'
+        for standard input or output). Returns the number of commands
+        processed"""
+        if self._use_compiled and infilename != '-':
+            try:
+                program = load_program(infilename)
+            except ValueError:
+                # a malformed file fails part way through, as it always has
+                program = None
+            if program is not None:
+                with open_output(outfilename) as outfile:
+                    return self.run_program(program, outfile)
+        with open_input(infilename) as infile, open_output(outfilename) as outfile:
+            return self.run(infile, outfile)
+
+
+def open_input(infilename):
+    """opens an input file by name, '-' being standard input"""
+    if infilename == '-':
+        return open(sys.stdin.fileno(), 'r', closefd=False)
+    return open(infilename, 'r')
+
+
+def open_output(outfilename):
+    """opens an output file by name, '-' being standard output"""
+    if outfilename == '-':
+        return open(sys.stdout.fileno(), 'w', closefd=False,
+                    buffering=MoveChecker.OUTPUT_BUFFER_SIZE)
+    return open(outfilename, 'w', buffering=MoveChecker.OUTPUT_BUFFER_SIZE)
+
+
+def run(infilename, outfilename, board_class=Board, debug=False,
+        use_threads=False, use_compiled=False):
+    """processes one command file into an output file"""
+    return MoveChecker(board_class, debug, use_threads,
+                       use_compiled).run_files(infilename, outfilename)
+
+
+def main(argv):
+    # get the file names from the command line
+    if len(argv) < 3:
+        print("correct usage: "+argv[0] +
+              "inputfilename outputfilename [--bitboard] [--threaded] [--compiled] [--debug]")
+        print("use - as a file name for standard input or output")
+        print("perft <depth> <workers> in a command file counts over worker processes")
+        sys.exit(1)
+
+    options = argv[3:]
+    # the bitboard engine gives the same answers with mask operations
+    board_class = BitBoard if '--bitboard' in options else Board
+
+    run(argv[1], argv[2], board_class, '--debug' in options,
+        '--threaded' in options, '--compiled' in options)
+
+
+# program start here
+if __name__ == '__main__':
+    main(sys.argv)
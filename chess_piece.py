@@ -5,10 +5,15 @@
 
 from chess_utils import PieceInfo
 from chess_utils import BoardInfo
+from bitboard_utils import BETWEEN, BOARD_SIZE, BOARD_SQUARES, FULL_MASK, \
+    iter_packed_moves, move_to, sliding_attacks, square_index
 
 
 class ChessPiece:
 
+    # Pieces are shared flyweights, so keep them small
+    __slots__ = ('_row', '_col', '_label', '_color')
+
     # Initializes the ChessPiece
     def __init__(self, row, col, color, label):
         self._row = row
@@ -16,11 +21,6 @@ class ChessPiece:
         self._label = label
         self._color = color
 
-    # Moves the piece to a new position
-    def move(self, new_row, new_col):
-        self._row = new_row
-        self._col = new_col
-
     # Returns the color of the piece
     def get_color(self):
         return self._color
@@ -41,6 +41,70 @@ class ChessPiece:
         return []
 
 
+    # Returns a bitmask of the squares the piece can legally move to. Pieces
+    # that only know is_legal_move get it asked about every other square;
+    # staying put is never a move
+    def get_move_mask(self, board):
+        moves = 0
+        own_square = self._get_square()
+        for square in range(BOARD_SQUARES):
+            if (square != own_square and
+                    self.is_legal_move(square // BOARD_SIZE, square % BOARD_SIZE, board)):
+                moves |= 1 << square
+        return moves
+
+
+    # Lazily yields the piece's moves as packed (from << 6 | to) ints
+    def iter_moves(self, board):
+        return iter_packed_moves(self._get_square(), self.get_move_mask(board))
+
+
+    # Returns a mask of the squares whose contents decide the piece's moves;
+    # the board recomputes the piece's moves when one of them changes
+    def get_watch_mask(self, board):
+        return FULL_MASK
+
+
+    # Returns the bit index of the square the piece is on
+    def _get_square(self):
+        return square_index(self._row, self._col)
+
+
+    # Returns a mask of every occupied square on the board
+    def _get_occupancy(self, board):
+        return (board.get_color_mask(BoardInfo.WHITE) |
+                board.get_color_mask(BoardInfo.BLACK))
+
+
+    # Checks that no piece sits strictly between the piece and a destination
+    # on the same row, column or diagonal
+    def _is_path_clear(self, dest_row, dest_col, board):
+        between = BETWEEN[self._get_square()][square_index(dest_row, dest_col)]
+        return not between & self._get_occupancy(board)
+
+
+    # Looks up a slider's moves along the given lines, dropping the squares
+    # held by its own color
+    def _get_slider_moves(self, board, lines):
+        return self._get_slider_reach(board, lines) & ~board.get_color_mask(self._color)
+
+
+    # Looks up every square a slider reaches along the given lines, up to and
+    # including the first piece each way
+    def _get_slider_reach(self, board, lines):
+        return sliding_attacks(self._get_square(), self._get_occupancy(board), lines)
+
+
+    # Marks the piece's own square and the destination of every packed move
+    def mark_moves(self, board_data, moves):
+        char_label = self._label.value
+        board_data[self._row][self._col] = char_label
+        for move in moves:
+            to_square = move_to(move)
+            board_data[to_square // BOARD_SIZE][to_square % BOARD_SIZE] = char_label
+        return board_data
+
+
     # Ensures the piece is in the board's boundaries
     def _is_within_board(self, row, col):
         return 0 <= row < 8 and 0 <= col < 8
@@ -21,3 +21,12 @@ class PieceInfo(Enum):
     WHITE_QUEEN = 'Q'
     WHITE_KING = 'K'
     WHITE_BISHOP = 'B'
+
+
+# the byte each square holds in a compact board
+EMPTY_CODE = ord(PieceInfo.EMPTY.value)
+BLACK_CODE = ord(PieceInfo.BLACK.value)
+PIECE_CODES = frozenset(ord(label.value) for label in PieceInfo)
+# maps every byte that is not a piece label to the empty label
+LABEL_TABLE = bytes(code if code in PIECE_CODES else EMPTY_CODE
+                    for code in range(256))
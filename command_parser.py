@@ -0,0 +1,49 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Turns lines of a command file into Commands for the checker pipeline.
+
+from chess_utils import LABEL_TABLE
+from bitboard_utils import BOARD_SIZE, BOARD_SQUARES
+from collections import namedtuple
+from itertools import islice
+
+
+# command names
+READ_BOARD = 'readBoard'
+WRITE_BOARD = 'writeBoard'
+CHECK_MOVE = 'checkMove'
+MAKE_MOVE = 'makeMove'
+GEN_POSS_MOVES = 'genPossMoves'
+GEN_ALL_MOVES = 'genAllMoves'
+UNDO_MOVE = 'undoMove'
+UNDO_ALL = 'undoAll'
+PERFT = 'perft'
+QUIT = 'quit'
+
+# one parsed command: its name and its arguments. readBoard carries the 64
+# label bytes of the board; the other commands carry their argument text
+Command = namedtuple('Command', ['name', 'args'])
+
+
+def read_board_codes(lines):
+    """takes the next 8 lines as a board and returns its 64 label bytes;
+    any character that is not a piece label is an empty square"""
+    rows = [line[:BOARD_SIZE] for line in islice(lines, BOARD_SIZE)]
+    text = ''.join(rows)
+    if len(rows) < BOARD_SIZE or len(text) < BOARD_SQUARES:
+        raise ValueError("readBoard needs 8 rows of 8 squares")
+    return text.encode('ascii', 'replace').translate(LABEL_TABLE)
+
+
+def parse_commands(lines):
+    """turns lines of input into Commands, stopping after quit"""
+    lines = iter(lines)
+    for line in lines:
+        args = line.split()
+        if not args:
+            continue
+        if args[0] == READ_BOARD:
+            yield Command(READ_BOARD, read_board_codes(lines))
+        else:
+            yield Command(args[0], args[1:])
+            if args[0] == QUIT:
+                return
@@ -0,0 +1,182 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Compiles a command file once into a compact program of opcodes and packed
+# square indices, and caches it on disk next to the input, so reruns of the
+# same file skip parsing entirely.
+
+from command_parser import CHECK_MOVE, GEN_POSS_MOVES, MAKE_MOVE, QUIT, \
+    READ_BOARD, WRITE_BOARD, Command, parse_commands
+from bitboard_utils import BOARD_SIZE, BOARD_SQUARES
+import os
+import struct
+
+
+# opcodes; each is one byte followed by its operands
+OP_READ_BOARD = 1       # the 64 label bytes of the board
+OP_WRITE_BOARD = 2      # no operands
+OP_CHECK_MOVE = 3       # from square, to square
+OP_MAKE_MOVE = 4        # from square, to square
+OP_GEN_POSS_MOVES = 5   # square
+OP_QUIT = 6             # no operands
+OP_LINE = 7             # 4-byte length, then the command's words as text
+
+_MOVE_OPCODES = {CHECK_MOVE: OP_CHECK_MOVE, MAKE_MOVE: OP_MAKE_MOVE}
+
+# the row or column text the compiler may pack into a square index. Anything
+# else ('07', '+1', '8', 'x') is kept as text so it is echoed and fails
+# exactly as it does when read from the file
+_COORDINATES = {str(number): number for number in range(BOARD_SIZE)}
+
+# (row, col) of each packed square
+SQUARE_COORDS = [divmod(square, BOARD_SIZE) for square in range(BOARD_SQUARES)]
+
+# the cache file written next to a command file
+COMPILED_SUFFIX = '.cmdc'
+
+# cache header: magic with format version, then the source file's size and
+# modification time in nanoseconds
+_HEADER = struct.Struct('<4sQQ')
+_MAGIC = b'CMC1'
+_LENGTH = struct.Struct('<I')
+
+
+def _pack_squares(args, count):
+    """packs the first count pairs of coordinate words into square indices,
+    or returns None if any of them is not a plain board coordinate"""
+    if len(args) < 2 * count:
+        return None
+    squares = bytearray()
+    for index in range(0, 2 * count, 2):
+        row = _COORDINATES.get(args[index])
+        col = _COORDINATES.get(args[index + 1])
+        if row is None or col is None:
+            return None
+        squares.append(row * BOARD_SIZE + col)
+    return squares
+
+
+def compile_commands(commands):
+    """compiles Commands into a program, returned as bytes"""
+    program = bytearray()
+    for name, args in commands:
+        if name == READ_BOARD:
+            program.append(OP_READ_BOARD)
+            program += args
+            continue
+        if name == WRITE_BOARD:
+            program.append(OP_WRITE_BOARD)
+            continue
+        if name == QUIT:
+            program.append(OP_QUIT)
+            continue
+
+        squares = None
+        if name in _MOVE_OPCODES:
+            squares = _pack_squares(args, 2)
+            opcode = _MOVE_OPCODES[name]
+        elif name == GEN_POSS_MOVES:
+            squares = _pack_squares(args, 1)
+            opcode = OP_GEN_POSS_MOVES
+
+        if squares is None:
+            # unusual commands keep their text and take the text path
+            text = ' '.join([name] + args).encode('utf-8')
+            program.append(OP_LINE)
+            program += _LENGTH.pack(len(text))
+            program += text
+        else:
+            program.append(opcode)
+            program += squares
+    return bytes(program)
+
+
+def iter_program(program):
+    """yields the (opcode, operands) of each instruction of a program.
+    Moves give (from_row, from_col, to_row, to_col), genPossMoves gives
+    (row, col), readBoard gives the label bytes and a text line gives its
+    Command"""
+    position = 0
+    size = len(program)
+    while position < size:
+        opcode = program[position]
+        position += 1
+        if opcode == OP_CHECK_MOVE or opcode == OP_MAKE_MOVE:
+            yield opcode, (SQUARE_COORDS[program[position]] +
+                           SQUARE_COORDS[program[position + 1]])
+            position += 2
+        elif opcode == OP_GEN_POSS_MOVES:
+            yield opcode, SQUARE_COORDS[program[position]]
+            position += 1
+        elif opcode == OP_READ_BOARD:
+            yield opcode, program[position:position + BOARD_SQUARES]
+            position += BOARD_SQUARES
+        elif opcode == OP_LINE:
+            length, = _LENGTH.unpack_from(program, position)
+            position += _LENGTH.size
+            words = program[position:position + length].decode('utf-8').split(' ')
+            position += length
+            yield opcode, Command(words[0], words[1:])
+        elif opcode == OP_WRITE_BOARD or opcode == OP_QUIT:
+            yield opcode, None
+        else:
+            raise ValueError("bad opcode %d in compiled program" % opcode)
+
+
+def program_commands(program):
+    """turns a program back into the Commands it was compiled from"""
+    names = {OP_CHECK_MOVE: CHECK_MOVE, OP_MAKE_MOVE: MAKE_MOVE,
+             OP_GEN_POSS_MOVES: GEN_POSS_MOVES, OP_READ_BOARD: READ_BOARD,
+             OP_WRITE_BOARD: WRITE_BOARD, OP_QUIT: QUIT}
+    for opcode, operands in iter_program(program):
+        if opcode == OP_LINE:
+            yield operands
+        elif opcode == OP_READ_BOARD:
+            yield Command(READ_BOARD, operands)
+        else:
+            yield Command(names[opcode], [str(number) for number in operands or ()])
+
+
+def compiled_name(infilename):
+    """the cache file kept for a command file"""
+    return infilename + COMPILED_SUFFIX
+
+
+def _source_header(infilename):
+    """the cache header matching the command file as it is now"""
+    status = os.stat(infilename)
+    return _HEADER.pack(_MAGIC, status.st_size, status.st_mtime_ns)
+
+
+def load_program(infilename):
+    """returns the compiled program of a command file, reading it from the
+    cache when the cache matches the file and compiling (and caching) it
+    otherwise. Raises ValueError if the file cannot be parsed"""
+    header = _source_header(infilename)
+    try:
+        with open(compiled_name(infilename), 'rb') as cached:
+            data = cached.read()
+        if data[:_HEADER.size] == header:
+            return data[_HEADER.size:]
+    except OSError:
+        pass
+
+    with open(infilename, 'r') as infile:
+        program = compile_commands(parse_commands(infile))
+    save_program(infilename, header, program)
+    return program
+
+
+def save_program(infilename, header, program):
+    """writes a program to the command file's cache. The cache is only an
+    optimization, so a place that cannot be written to is skipped"""
+    cachename = compiled_name(infilename)
+    tempname = '%s.%d.tmp' % (cachename, os.getpid())
+    try:
+        with open(tempname, 'wb') as cached:
+            cached.write(header)
+            cached.write(program)
+        os.replace(tempname, cachename)
+    except OSError:
+        try:
+            os.remove(tempname)
+        except OSError:
+            pass
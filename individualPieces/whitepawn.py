@@ -9,11 +9,10 @@ class WhitePawn(ChessPiece):
         return 0 <= row < 9 and 0 <= col < 8
 
     def _is_empty_square(self, row, col, board):
-        return board._board_info[row][col] is None
+        return board.get_square_info(row, col) == BoardInfo.EMPTY
 
     def _is_capturable_piece(self, row, col, board):
-        target_piece = board._board_info[row][col]
-        return target_piece is not None and target_piece.get_color() == BoardInfo.BLACK
+        return board.get_square_info(row, col) == BoardInfo.BLACK
 
     def is_legal_move(self, dest_row, dest_col, board):
         if dest_row == self._row and dest_col == self._col:
@@ -0,0 +1,46 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# A bounded least-recently-used cache that keeps hit and miss counts.
+
+from collections import OrderedDict
+
+
+class LRUCache():
+    """Maps keys to values, dropping the least recently used entry once
+    max_size entries are stored"""
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the value stored for key, or None if there is none"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Stores value for key, evicting the oldest entry if full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops every entry and resets the counts"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        """Returns the fraction of lookups that found a value"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._entries)
@@ -3,14 +3,16 @@
 # 10/22/2021
 
 from chess_piece import ChessPiece
-from board import Board
 from chess_utils import BoardInfo
 from chess_utils import PieceInfo
+from bitboard_utils import KING_ATTACKS, square_bit
 
 
 class BlackPiece(ChessPiece):
     """A black piece that never does anything -- we're always playing white"""
 
+    __slots__ = ()
+
     def __init__(self, row_num, col_num):
         ChessPiece.__init__(self, row_num, col_num,
                             BoardInfo.BLACK, PieceInfo.BLACK)
@@ -21,30 +23,34 @@ class BlackPiece(ChessPiece):
         board_data[self._row][self._col] = self._label.value
         return board_data
 
+    def get_watch_mask(self, board):
+        """A black piece never moves, so nothing on the board affects it"""
+        return 0
+
 
 class King(ChessPiece):
+    __slots__ = ()
+
     def __init__(self, row_num, col_num, color, label):
         ChessPiece.__init__(self, row_num, col_num, color, label)
 
     def is_legal_move(self, dest_row, dest_col, board):
         """Returns true if this piece can legally move to the specified
         location on the provide board"""
-        row_diff = abs(self._row-dest_row)
-        col_diff = abs(self._col-dest_col)
-        square_type = board.get_square_info(dest_row, dest_col)
+        if not self._is_within_board(dest_row, dest_col):
+            return False
+        return bool(self.get_move_mask(board) & square_bit(dest_row, dest_col))
 
-        is_legal = (row_diff == 1 and col_diff < 2 or row_diff < 2 and col_diff ==
-                    1) and square_type != self._color and square_type != BoardInfo.OFF_THE_BOARD
-        return is_legal
+    def get_move_mask(self, board):
+        """Returns the neighbouring squares not held by this piece's color"""
+        return (KING_ATTACKS[self._get_square()] &
+                ~board.get_color_mask(self._color))
+
+    def get_watch_mask(self, board):
+        """Returns the neighbouring squares, whatever they hold"""
+        return KING_ATTACKS[self._get_square()]
 
     def generate_legal_moves(self, board_data, board):
         """Adds representation for the legal moves to the provided 
         board representation and returns the result"""
-        char_label = self._label.value
-        board_data[self._row][self._col] = char_label
-        for row in range(self._row-1, self._row+2):
-            for col in range(self._col-1, self._col+2):
-                square_type = board.get_square_info(row, col)
-                if square_type != self._color and square_type != BoardInfo.OFF_THE_BOARD:
-                    board_data[row][col] = char_label
-        return board_data
+        return self.mark_moves(board_data, self.iter_moves(board))
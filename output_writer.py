@@ -0,0 +1,28 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Collects output text and hands it to the output file in large batches,
+# so a long command file costs a few big writes instead of many small ones.
+
+
+class OutputWriter():
+    """A write-only wrapper that batches text for an open output file"""
+    FLUSH_SIZE = 1 << 16
+
+    def __init__(self, outfile, flush_size=FLUSH_SIZE):
+        self._outfile = outfile
+        self._flush_size = flush_size
+        self._pending = []
+        self._pending_size = 0
+
+    def write(self, text):
+        """queues text, passing the batch on once it is large enough"""
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self._flush_size:
+            self.flush()
+
+    def flush(self):
+        """passes everything queued on to the output file"""
+        if self._pending:
+            self._outfile.write(''.join(self._pending))
+            self._pending = []
+            self._pending_size = 0
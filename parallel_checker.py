@@ -0,0 +1,104 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Checks one large command file on a pool of worker processes. Every
+# readBoard starts from a fresh board, so the file is cut at readBoard
+# commands, the pieces run independently and their outputs are written
+# back in the original order, exactly as a serial run would write them.
+
+from board import Board
+from bit_board import BitBoard
+from chess_move_checker import MoveChecker, open_input, open_output
+from command_parser import QUIT, READ_BOARD
+from worker_pool import pool_size, start_pool, worker_state
+from collections import deque
+import argparse
+import io
+import sys
+
+
+# roughly how many input lines each worker task gets
+CHUNK_LINES = 4096
+
+def _make_checker(use_bitboard):
+    """builds a worker's checker, which every chunk it runs reuses"""
+    return MoveChecker(BitBoard if use_bitboard else Board)
+
+
+def _check_chunk(text):
+    """runs one chunk of commands in a worker; returns its output text and
+    its command count"""
+    output = io.StringIO()
+    command_count = worker_state().run(io.StringIO(text), output)
+    return output.getvalue(), command_count
+
+
+def split_chunks(lines, chunk_lines=CHUNK_LINES):
+    """yields the input as text chunks of about chunk_lines lines. Every
+    chunk after the first starts with a readBoard, and nothing after quit
+    is kept"""
+    chunk = []
+    lines = iter(lines)
+    for line in lines:
+        # commands are named by their first word, as parse_commands reads them
+        args = line.split()
+        command = args[0] if args else ''
+        if command == READ_BOARD:
+            if len(chunk) >= chunk_lines:
+                yield ''.join(chunk)
+                chunk = []
+            # the board rows belong to this readBoard, whatever they say
+            chunk.append(line)
+            for row in range(Board.BOARD_SIZE):
+                chunk.append(next(lines, ''))
+            continue
+        chunk.append(line)
+        if command == QUIT:
+            break
+    if chunk:
+        yield ''.join(chunk)
+
+
+def run_parallel(infile, outfile, workers=None, use_bitboard=False,
+                 chunk_lines=CHUNK_LINES):
+    """checks an open command file on a process pool, writing the output
+    to an open file in input order. Returns the number of commands"""
+    workers = pool_size(workers)
+    command_count = 0
+    with start_pool(_make_checker, (use_bitboard,), workers) as pool:
+        # keep a few chunks per worker in flight and write results in order
+        pending = deque()
+        for chunk in split_chunks(infile, chunk_lines):
+            pending.append(pool.submit(_check_chunk, chunk))
+            if len(pending) >= workers * 4:
+                command_count += _write_result(pending.popleft(), outfile)
+        while pending:
+            command_count += _write_result(pending.popleft(), outfile)
+    return command_count
+
+
+def _write_result(future, outfile):
+    """writes a finished chunk's output; returns its command count"""
+    text, command_count = future.result()
+    outfile.write(text)
+    return command_count
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        description='Check one command file on several processes')
+    parser.add_argument('infile', help="command file ('-' for standard input)")
+    parser.add_argument('outfile', help="output file ('-' for standard output)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--bitboard', action='store_true',
+                        help='use the bitboard engine')
+    parser.add_argument('--chunk-lines', type=int, default=CHUNK_LINES,
+                        help='input lines per worker task (default: %(default)s)')
+    args = parser.parse_args(argv[1:])
+
+    with open_input(args.infile) as infile, open_output(args.outfile) as outfile:
+        run_parallel(infile, outfile, args.workers, args.bitboard,
+                     args.chunk_lines)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
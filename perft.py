@@ -0,0 +1,130 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Counts every sequence of moves to a given depth from a position (perft).
+# Black pieces never move, so every ply is a white move. The tree is walked
+# on one board with make_move and unmake_move, never copying it. Positions
+# reached by different move orders share their counts through a
+# transposition table, and the first moves can be split over processes.
+
+from board import Board
+from bit_board import BitBoard
+from chess_utils import BoardInfo
+from bitboard_utils import move_coords
+from command_parser import READ_BOARD, parse_commands
+from lru_cache import LRUCache
+import argparse
+import sys
+import time
+
+
+# subtree counts kept by a transposition table
+TABLE_SIZE = 1 << 18
+
+# the table shared by every perft run in this process; counts depend only on
+# the position and the depth, so they hold across boards
+transpositions = LRUCache(TABLE_SIZE)
+
+
+def perft(board, depth, table=None):
+    """Returns the number of move sequences of exactly depth moves. Counts
+    are looked up in and added to table, an LRUCache keyed by (position
+    hash, depth), when one is given"""
+    if depth <= 0:
+        return 1
+    # the moves are listed before any is made, since making one changes them
+    moves = list(board.generate_all_moves(BoardInfo.WHITE))
+    if depth == 1:
+        return len(moves)
+
+    if table is not None:
+        key = (board.get_hash(), depth)
+        count = table.get(key)
+        if count is not None:
+            return count
+
+    count = 0
+    for move in moves:
+        board.make_move(*move_coords(move))
+        count += perft(board, depth - 1, table)
+        board.unmake_move()
+
+    if table is not None:
+        table.put(key, count)
+    return count
+
+
+def perft_divide(board, depth, table=None):
+    """Returns a list of (packed move, count) for every first move, the
+    count being the sequences of depth moves that start with it"""
+    if depth <= 0:
+        return []
+    counts = []
+    for move in list(board.generate_all_moves(BoardInfo.WHITE)):
+        board.make_move(*move_coords(move))
+        counts.append((move, perft(board, depth - 1, table)))
+        board.unmake_move()
+    return counts
+
+
+def _count_root_move(codes, move, depth):
+    """counts, in a worker, the sequences of depth moves starting with move
+    on the position given by its label bytes. Each worker has its own board
+    and uses its process's table"""
+    from worker_pool import worker_state
+    board = worker_state()
+    board.load_squares(codes)
+    board.make_move(*move_coords(move))
+    return perft(board, depth - 1, transpositions)
+
+
+def perft_divide_parallel(board, depth, workers=None):
+    """perft_divide with the first moves shared out over a process pool.
+    Each worker keeps its own transposition table across the moves it gets.
+    The process pool modules are only imported here, so checkers that never
+    count in parallel do not pay to load them"""
+    if depth <= 1:
+        return perft_divide(board, depth)
+    from worker_pool import start_pool
+    moves = list(board.generate_all_moves(BoardInfo.WHITE))
+    codes = board.get_codes()
+    with start_pool(type(board), (), workers) as pool:
+        counts = pool.map(_count_root_move, [codes] * len(moves), moves,
+                          [depth] * len(moves))
+        return list(zip(moves, counts))
+
+
+def main(argv):
+    # a benchmark: perft on the first board of a command file
+    parser = argparse.ArgumentParser(
+        description='Count the move sequences from the first board of a command file')
+    parser.add_argument('infile', help='command file holding a readBoard')
+    parser.add_argument('depth', type=int, help='moves in each sequence')
+    parser.add_argument('--bitboard', action='store_true',
+                        help='use the bitboard engine')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='split the first moves over this many processes')
+    parser.add_argument('--no-table', action='store_true',
+                        help='count every subtree instead of sharing counts')
+    args = parser.parse_args(argv[1:])
+
+    board = BitBoard() if args.bitboard else Board()
+    with open(args.infile, 'r') as infile:
+        for name, command_args in parse_commands(infile):
+            if name == READ_BOARD:
+                board.load_squares(command_args)
+                break
+
+    start = time.perf_counter()
+    if args.workers:
+        counts = perft_divide_parallel(board, args.depth, args.workers)
+    else:
+        counts = perft_divide(board, args.depth,
+                              None if args.no_table else transpositions)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    nodes = sum(count for move, count in counts) if args.depth > 0 else 1
+    for move, count in counts:
+        print("({},{}) to ({},{}): {}".format(*move_coords(move), count))
+    print("Nodes: %d in %.2fs (%.0f nodes/s)" % (nodes, elapsed, nodes / elapsed))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,45 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Creates chess pieces from their labels. Boards only store label codes and
+# ask here for a piece when they need one, so each piece is a shared flyweight.
+
+from chess_utils import BoardInfo
+from chess_utils import PieceInfo
+from mec_pieces import BlackPiece
+from mec_pieces import King
+from my_pieces import Knight, Rook, WhitePawn, Bishop, Queen
+
+
+# the class of each white piece, by label
+PIECE_CLASSES = {
+    PieceInfo.WHITE_KING.value: King,
+    PieceInfo.WHITE_KNIGHT.value: Knight,
+    PieceInfo.WHITE_ROOK.value: Rook,
+    PieceInfo.WHITE_PAWN.value: WhitePawn,
+    PieceInfo.WHITE_BISHOP.value: Bishop,
+    PieceInfo.WHITE_QUEEN.value: Queen,
+}
+
+
+def make_piece(row, column, label):
+    """create a piece given a location and label"""
+    if label == PieceInfo.BLACK.value:
+        return BlackPiece(row, column)
+    piece_class = PIECE_CLASSES.get(label)
+    if piece_class == None:
+        return None
+    return piece_class(row, column, BoardInfo.WHITE, PieceInfo(label))
+
+
+# one shared piece per (label code, square), made the first time it is needed
+_flyweights = {}
+
+
+def get_piece(code, square):
+    """Returns the shared piece for a label code on a square (None if the
+    code is not a piece)"""
+    key = (code, square)
+    piece = _flyweights.get(key)
+    if piece is None:
+        piece = make_piece(square // 8, square % 8, chr(code))
+        _flyweights[key] = piece
+    return piece
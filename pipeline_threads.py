@@ -0,0 +1,75 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Runs a stage of the checker pipeline on its own thread. The stage's items
+# reach the next stage, in order, through a bounded queue, so a slow reader
+# or writer overlaps with move checking instead of stalling it.
+
+import queue
+import threading
+
+
+QUEUE_SIZE = 64
+BATCH_SIZE = 256
+
+# marks the end of a stage's items
+_DONE = object()
+
+
+class _Failure():
+    """carries an exception raised by a stage over to the consuming thread"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def threaded(items, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE):
+    """iterates items on a background thread and returns a generator of the
+    same items in the same order. Items are passed in batches of up to
+    batch_size, and at most queue_size batches wait at once, so a producer
+    that gets ahead blocks until the consumer catches up"""
+    batches = queue.Queue(queue_size)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            batch = []
+            for item in items:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not _put(batches, batch, stop):
+                        return
+                    batch = []
+            if batch and not _put(batches, batch, stop):
+                return
+            _put(batches, _DONE, stop)
+        except BaseException as error:
+            _put(batches, _Failure(error), stop)
+
+    threading.Thread(target=produce, daemon=True).start()
+    return _consume(batches, stop)
+
+
+def _put(batches, batch, stop):
+    """queues a batch, giving up if the consumer has stopped listening.
+    Returns whether the batch was queued"""
+    while not stop.is_set():
+        try:
+            batches.put(batch, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _consume(batches, stop):
+    """yields the items of each queued batch until the producer is done"""
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _DONE:
+                return
+            if isinstance(batch, _Failure):
+                raise batch.error
+            yield from batch
+    finally:
+        # lets the producer finish if we stop early
+        stop.set()
@@ -13,4 +13,105 @@ python3 chess_move_checker.py bishopInput.txt my_outfile
 diff my_outfile sample_bishopOutput.txt
 
 python3 chess_move_checker.py knightInput.txt my_outfile
-diff my_outfile sample_knightOutput.txt
\ No newline at end of file
+diff my_outfile sample_knightOutput.txt
+
+python3 chess_move_checker.py queenInput.txt my_outfile --bitboard
+diff my_outfile sample_queenOutput.txt
+
+python3 chess_move_checker.py pawnInput.txt my_outfile --bitboard
+diff my_outfile sample_pawnOutput.txt
+
+python3 chess_move_checker.py rookInput.txt my_outfile --bitboard
+diff my_outfile sample_rookOutput.txt
+
+python3 chess_move_checker.py bishopInput.txt my_outfile --bitboard
+diff my_outfile sample_bishopOutput.txt
+
+python3 chess_move_checker.py knightInput.txt my_outfile --bitboard
+diff my_outfile sample_knightOutput.txt
+
+python3 chess_move_checker.py queenInput.txt my_outfile --compiled
+diff my_outfile sample_queenOutput.txt
+
+python3 chess_move_checker.py pawnInput.txt my_outfile --compiled
+diff my_outfile sample_pawnOutput.txt
+
+python3 chess_move_checker.py rookInput.txt my_outfile --compiled
+diff my_outfile sample_rookOutput.txt
+
+python3 chess_move_checker.py bishopInput.txt my_outfile --compiled
+diff my_outfile sample_bishopOutput.txt
+
+python3 chess_move_checker.py knightInput.txt my_outfile --compiled
+diff my_outfile sample_knightOutput.txt
+
+python3 chess_move_checker.py allMovesInput.txt my_outfile
+diff my_outfile sample_allMovesOutput.txt
+
+python3 chess_move_checker.py allMovesInput.txt my_outfile --bitboard
+diff my_outfile sample_allMovesOutput.txt
+
+python3 chess_move_checker.py undoInput.txt my_outfile
+diff my_outfile sample_undoOutput.txt
+
+python3 chess_move_checker.py undoInput.txt my_outfile --bitboard
+diff my_outfile sample_undoOutput.txt
+
+python3 chess_move_checker.py perftInput.txt my_outfile
+diff my_outfile sample_perftOutput.txt
+
+python3 chess_move_checker.py perftInput.txt my_outfile --bitboard
+diff my_outfile sample_perftOutput.txt
+
+sed 's/^perft .*/& 2/' perftInput.txt | python3 chess_move_checker.py - my_outfile
+diff my_outfile sample_perftOutput.txt
+
+python3 chess_move_checker.py queenInput.txt my_outfile --threaded
+diff my_outfile sample_queenOutput.txt
+
+python3 chess_move_checker.py pawnInput.txt my_outfile --threaded
+diff my_outfile sample_pawnOutput.txt
+
+python3 chess_move_checker.py rookInput.txt my_outfile --threaded
+diff my_outfile sample_rookOutput.txt
+
+python3 chess_move_checker.py bishopInput.txt my_outfile --threaded
+diff my_outfile sample_bishopOutput.txt
+
+python3 chess_move_checker.py knightInput.txt my_outfile --threaded
+diff my_outfile sample_knightOutput.txt
+
+python3 chess_move_checker.py allMovesInput.txt my_outfile --threaded
+diff my_outfile sample_allMovesOutput.txt
+
+python3 chess_move_checker.py undoInput.txt my_outfile --threaded
+diff my_outfile sample_undoOutput.txt
+
+python3 chess_move_checker.py perftInput.txt my_outfile --threaded
+diff my_outfile sample_perftOutput.txt
+
+python3 parallel_checker.py queenInput.txt my_outfile --workers 2 --chunk-lines 1
+diff my_outfile sample_queenOutput.txt
+
+python3 parallel_checker.py pawnInput.txt my_outfile --workers 2 --chunk-lines 1
+diff my_outfile sample_pawnOutput.txt
+
+python3 parallel_checker.py rookInput.txt my_outfile --workers 2 --chunk-lines 1
+diff my_outfile sample_rookOutput.txt
+
+python3 parallel_checker.py bishopInput.txt my_outfile --workers 2 --chunk-lines 1
+diff my_outfile sample_bishopOutput.txt
+
+python3 parallel_checker.py knightInput.txt my_outfile --workers 2 --chunk-lines 1
+diff my_outfile sample_knightOutput.txt
+
+python3 parallel_checker.py allMovesInput.txt my_outfile --workers 2 --chunk-lines 1
+diff my_outfile sample_allMovesOutput.txt
+
+python3 parallel_checker.py undoInput.txt my_outfile --workers 2 --chunk-lines 1
+diff my_outfile sample_undoOutput.txt
+
+python3 parallel_checker.py perftInput.txt my_outfile --workers 2 --chunk-lines 1
+diff my_outfile sample_perftOutput.txt
+
+python3 check_batch_moves.py
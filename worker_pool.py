@@ -0,0 +1,34 @@
+# Joseph Schildt and Daulton Widlacki, Program 3, IT 327 001
+# Process pools whose workers each build one object (a checker, a board)
+# when they start, so every task a worker runs reuses it.
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+
+# the object built by this worker process, if it is one
+_worker_state = None
+
+
+def _start_worker(factory, args):
+    """builds the worker's object once, when the worker process starts"""
+    global _worker_state
+    _worker_state = factory(*args)
+
+
+def worker_state():
+    """Returns the object built for the current worker process"""
+    return _worker_state
+
+
+def pool_size(workers=None):
+    """the number of worker processes to use: workers, or one per core"""
+    return workers or os.cpu_count() or 1
+
+
+def start_pool(factory, args=(), workers=None):
+    """Returns a ProcessPoolExecutor of pool_size(workers) processes, each of
+    which calls factory(*args) once as it starts. factory must be picklable,
+    such as a class or a module-level function"""
+    return ProcessPoolExecutor(pool_size(workers), initializer=_start_worker,
+                               initargs=(factory, args))